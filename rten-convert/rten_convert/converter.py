@@ -1,18 +1,28 @@
 #!/usr/bin/env python
 
 from argparse import ArgumentParser
+from array import array
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 import hashlib
+from itertools import chain
 import json
+import math
+import mmap
+import os
 from os.path import splitext
+import struct
 import sys
-from typing import Any, Callable, Literal, Optional, cast
+from threading import Lock
+from typing import Any, Callable, Literal, Optional, Sequence, cast
 
 import flatbuffers
 import numpy as np
 import onnx
 import onnx.numpy_helper as numpy_helper
-from onnx import TensorProto, ValueInfoProto
+from onnx import TensorProto
 
 import rten_convert.schema_generated as sg
 
@@ -20,6 +30,7 @@ AttributeValue = int | float | str | list[int]
 
 
 EMITTED_WARNINGS: set[str] = set()
+EMITTED_WARNINGS_LOCK = Lock()
 
 
 def warn_once(msg: str):
@@ -27,11 +38,12 @@ def warn_once(msg: str):
     Emit a warning if not already emitted.
 
     This is used to reduce output noise if the same problem arises many times
-    when converting a model.
+    when converting a model. It is safe to call from multiple threads.
     """
-    if msg in EMITTED_WARNINGS:
-        return
-    EMITTED_WARNINGS.add(msg)
+    with EMITTED_WARNINGS_LOCK:
+        if msg in EMITTED_WARNINGS:
+            return
+        EMITTED_WARNINGS.add(msg)
     print(f"WARNING: {msg}", file=sys.stderr)
 
 
@@ -76,7 +88,7 @@ class ConstantNode(Node):
     def get_scalar(self):
         if self.shape != []:
             return None
-        return self.data[0]
+        return self.data.item()
 
 
 class OperatorNode(Node):
@@ -167,18 +179,44 @@ class Metadata:
     run_url: Optional[str] = None
 
 
-# Mapping of ONNX attribute types to the field on an AttributeProto which
-# contains the value. Note that if you try to access the wrong field on an
-# AttributeProto, you get a default value instead of an exception.
+# Mapping of attribute type names used by `ONNXOperatorReader` to the ONNX
+# attribute type and the field on an AttributeProto which contains the value.
+# Note that if you try to access the wrong field on an AttributeProto, you get a
+# default value instead of an exception.
 value_fields = {
-    onnx.AttributeProto.FLOAT: "f",
-    onnx.AttributeProto.INT: "i",
-    onnx.AttributeProto.INTS: "ints",
-    onnx.AttributeProto.STRING: "s",
-    onnx.AttributeProto.TENSOR: "t",
+    "float": (onnx.AttributeProto.FLOAT, "f"),
+    "floats": (onnx.AttributeProto.FLOATS, "floats"),
+    "int": (onnx.AttributeProto.INT, "i"),
+    "ints": (onnx.AttributeProto.INTS, "ints"),
+    "string": (onnx.AttributeProto.STRING, "s"),
+    "strings": (onnx.AttributeProto.STRINGS, "strings"),
+    "tensor": (onnx.AttributeProto.TENSOR, "t"),
 }
 
 
+def enum_values(enum: type) -> dict[str, int]:
+    """Return a map of variant name to value for an enum generated by flatc."""
+    return {
+        name: value for name, value in vars(enum).items() if not name.startswith("_")
+    }
+
+
+OPERATOR_TYPES = enum_values(sg.OperatorType)
+"""
+Map of RTen operator name to `sg.OperatorType` value.
+"""
+
+OPERATOR_ATTRS_TYPES = {
+    getattr(sg, name + "T"): value
+    for name, value in enum_values(sg.OperatorAttrs).items()
+    if value != sg.OperatorAttrs.NONE
+}
+"""
+Map of operator attributes class (eg. `sg.ConvAttrsT`) to the corresponding
+`sg.OperatorAttrs` value.
+"""
+
+
 def snake_case_to_pascal_case(s: str) -> str:
     """Transform a snake_case string to PascalCase."""
     return "".join([word[0].upper() + word[1:] for word in s.split("_")])
@@ -210,20 +248,40 @@ class ONNXOperatorReader:
     that needs to be converted to a dynamic input.
     """
 
+    _attrs: dict[str, onnx.AttributeProto]
+    """Map of attribute name to attribute."""
+
+    _string_attrs: dict[str, str]
+    """Map of attribute name to decoded value, for string attributes."""
+
     _handled_attrs: set[str]
     """Names of attributes that have been handled."""
 
+    base_dir: str
+    """Directory that external data locations are relative to."""
+
     def __init__(
         self,
         onnx_op: onnx.OperatorProto,
         input_indexes: list[int | None],
         add_node: Callable[[Node], int],
+        base_dir: str = "",
     ):
         self.onnx_op = onnx_op
+        self.base_dir = base_dir
 
         self.add_node = add_node
         self.input_indexes = input_indexes.copy()
 
+        self._attrs = {attr.name: attr for attr in onnx_op.attribute}
+
+        # String attribute values are stored as bytes, so we have to decode
+        # them.
+        self._string_attrs = {
+            attr.name: attr.s.decode()
+            for attr in onnx_op.attribute
+            if attr.type == onnx.AttributeProto.STRING
+        }
         self._handled_attrs = set()
 
     def get_attr(self, name: str, expected_type: str, default):
@@ -231,22 +289,17 @@ class ONNXOperatorReader:
 
         self._handled_attrs.add(name)
 
-        type_code = getattr(onnx.AttributeProto, expected_type.upper())
-        for attr in self.onnx_op.attribute:
-            if attr.name == name:
-                if attr.type != type_code:
-                    raise Exception(
-                        f"Attribute {name} type does not match {expected_type}"
-                    )
-                val = getattr(attr, value_fields[type_code])
+        type_code, field = value_fields[expected_type]
+        attr = self._attrs.get(name)
+        if attr is None:
+            return default
 
-                # String attribute values are stored as bytes, so we have to decode
-                # them.
-                if expected_type == "string":
-                    val = val.decode()
+        if attr.type != type_code:
+            raise Exception(f"Attribute {name} type does not match {expected_type}")
 
-                return val
-        return default
+        if expected_type == "string":
+            return self._string_attrs[name]
+        return getattr(attr, field)
 
     def get_bool_attr(self, name: str, default: bool) -> bool:
         """
@@ -340,15 +393,15 @@ class ONNXOperatorReader:
         match attr_type:
             case "int":
                 shape = []
-                data = np.array(attr_val).astype(np.int32)
+                data = np.array(attr_val, dtype=np.int32)
 
             case "float":
                 shape = []
-                data = np.array(attr_val).astype(np.float32)
+                data = np.array(attr_val, dtype=np.float32)
 
             case "ints":
                 shape = [len(attr_val)]
-                data = np.array([attr_val]).astype(np.int32)
+                data = np.array(attr_val, dtype=np.int32)
             case _:
                 raise ValueError(
                     f'Unable to generate input from "{attr_name}" attribute of type "{attr_type}"'
@@ -415,11 +468,169 @@ def check_ints_length(name: str, ints: list[int], allowed_length: int):
         raise Exception(f'Attribute "{name}" must have {allowed_length} values')
 
 
+# Map of ONNX data type to NumPy dtype, for tensor types that can be read
+# directly from a tensor's `raw_data` field.
+RAW_DATA_DTYPES: dict[int, np.dtype] = {
+    TensorProto.FLOAT: np.dtype(np.float32),
+    TensorProto.INT32: np.dtype(np.int32),
+    TensorProto.INT64: np.dtype(np.int64),
+}
+
+# Map of ONNX data type to the `TensorProto` field that holds the tensor's data
+# when it is not stored in `raw_data`, for types in `RAW_DATA_DTYPES`.
+TYPED_DATA_FIELDS: dict[int, str] = {
+    TensorProto.FLOAT: "float_data",
+    TensorProto.INT32: "int32_data",
+    TensorProto.INT64: "int64_data",
+}
+
+
+class ExternalDataFiles:
+    """
+    Memory-mapped external data files of a model.
+
+    Models with external data usually store all of their tensors in one file,
+    so each file is mapped once and shared by all tensors that reference it.
+    The mappings should be closed once the model has been converted, which
+    can be done by using this class as a context manager.
+
+    It is safe to use from multiple threads.
+    """
+
+    def __init__(self):
+        self._files: dict[str, mmap.mmap] = {}
+        self._lock = Lock()
+
+    def map(self, path: str) -> mmap.mmap:
+        """Memory-map a file, or return the existing mapping."""
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._files:
+                with open(path, "rb") as file:
+                    self._files[path] = mmap.mmap(
+                        file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+            return self._files[path]
+
+    def close(self):
+        """
+        Close all mappings.
+
+        Mappings which are still used by arrays can't be closed. These are
+        closed when the last array that uses them is freed.
+        """
+        with self._lock:
+            files = list(self._files.values())
+            self._files.clear()
+
+        for file in files:
+            try:
+                file.close()
+            except BufferError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def array_from_external_data(
+    tensor: onnx.TensorProto, base_dir: str, data_files: ExternalDataFiles
+) -> np.ndarray:
+    """
+    Create a view of the data for a tensor which is stored in an external file.
+
+    This avoids reading the whole tensor into memory up front. The data is read
+    from disk as the tensor is serialized.
+
+    :param tensor: Tensor with external data and a type in `RAW_DATA_DTYPES`
+    :param base_dir: Directory that external data locations are relative to
+    :param data_files: Mappings of external data files
+    """
+    info = {entry.key: entry.value for entry in tensor.external_data}
+    dtype = RAW_DATA_DTYPES[tensor.data_type]
+    shape = tuple(tensor.dims)
+    count = math.prod(shape)
+
+    # Empty files can't be memory-mapped.
+    if count == 0:
+        return np.empty(shape, dtype=dtype)
+
+    # Don't allow a model to read files outside of its own directory.
+    location = info["location"]
+    if os.path.isabs(location):
+        raise ValueError(
+            f'External data location "{location}" of tensor "{tensor.name}" must be a relative path'
+        )
+    base_dir = os.path.realpath(base_dir)
+    path = os.path.realpath(os.path.join(base_dir, location))
+    if os.path.commonpath([base_dir, path]) != base_dir:
+        raise ValueError(
+            f'External data location "{location}" of tensor "{tensor.name}" is outside the model directory'
+        )
+
+    data = data_files.map(path)
+    offset = int(info.get("offset", 0))
+    length = int(info.get("length", count * dtype.itemsize))
+    if length != count * dtype.itemsize or offset < 0 or offset + length > len(data):
+        raise ValueError(
+            f'External data of tensor "{tensor.name}" does not match its shape and type'
+        )
+    return np.frombuffer(data, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def array_from_onnx_tensor(
+    tensor: onnx.TensorProto,
+    base_dir: str = "",
+    data_files: Optional[ExternalDataFiles] = None,
+) -> np.ndarray:
+    """
+    Convert an ONNX tensor to a NumPy array.
+
+    Tensors of common types whose data is stored in `raw_data` are returned as
+    a view of the serialized bytes, those whose data is stored in an external
+    file are memory-mapped and those whose data is stored in typed fields (eg.
+    `float_data`) are copied directly into an array of the right type. Other
+    tensors are converted using `numpy_helper.to_array`.
+
+    :param tensor: The ONNX tensor
+    :param base_dir: Directory that external data locations are relative to
+    :param data_files: Mappings of external data files to share. If not
+      provided, the tensor's external data file is mapped separately.
+    """
+    dtype = RAW_DATA_DTYPES.get(tensor.data_type)
+    if dtype is None:
+        return numpy_helper.to_array(tensor, base_dir)
+
+    # Serialized tensor data is always little-endian, so on big-endian hosts we
+    # let `to_array` handle byte-swapping.
+    is_little_endian = sys.byteorder == "little"
+
+    if tensor.data_location == TensorProto.EXTERNAL:
+        if is_little_endian:
+            return array_from_external_data(
+                tensor, base_dir, data_files or ExternalDataFiles()
+            )
+    elif tensor.HasField("raw_data"):
+        if is_little_endian:
+            return np.frombuffer(tensor.raw_data, dtype=dtype).reshape(tensor.dims)
+    else:
+        typed_data = getattr(tensor, TYPED_DATA_FIELDS[tensor.data_type])
+        return np.asarray(typed_data, dtype=dtype).reshape(tensor.dims)
+
+    return numpy_helper.to_array(tensor, base_dir)
+
+
 def constant_node_from_onnx_initializer(
-    tensor: onnx.TensorProto, op_name: Optional[str]
+    tensor: onnx.TensorProto,
+    op_name: Optional[str],
+    base_dir: str = "",
+    data_files: Optional[ExternalDataFiles] = None,
 ) -> ConstantNode:
     dims = list(tensor.dims)
-    data = numpy_helper.to_array(tensor)
+    data = array_from_onnx_tensor(tensor, base_dir, data_files)
 
     match data.dtype.name:
         # Types that don't need to change
@@ -442,13 +653,27 @@ def constant_node_from_onnx_initializer(
             # this to an `int32` in the model, this will cause an overflow. To
             # resolve this, clamp the value to the min/max values for the
             # smaller integer type we are using.
+            #
+            # To avoid scanning large tensors element by element, and emitting
+            # a warning for every distinct value, only the minimum and maximum
+            # values are reported.
             i32 = np.iinfo(np.int32)
-            out_of_range_mask = np.logical_or(data > i32.max, data < i32.min)
-            for val in data[out_of_range_mask]:
-                warn_once(
-                    f"Clamping out-of-range tensor value {val} to [{i32.min}, {i32.max}]"
-                )
-            data = data.clip(i32.min, i32.max).astype(np.int32)
+            if data.size > 0:
+                for val in (data.min(), data.max()):
+                    if val < i32.min or val > i32.max:
+                        warn_once(
+                            f"Clamping out-of-range tensor value {val} to [{i32.min}, {i32.max}]"
+                        )
+
+            # Clamp and narrow in a single pass, writing directly into the
+            # int32 output rather than materializing a clamped int64 copy.
+            data = np.clip(
+                data,
+                i32.min,
+                i32.max,
+                out=np.empty(data.shape, dtype=np.int32),
+                casting="same_kind",
+            )
 
         case _:
             raise ValueError(
@@ -458,7 +683,51 @@ def constant_node_from_onnx_initializer(
     return ConstantNode(name=tensor.name, shape=dims, data=data)
 
 
-def constant_node_from_onnx_constant_op(onnx_op: onnx.OperatorProto) -> ConstantNode:
+# Map of ONNX data type to the `struct` format used to read a value from
+# `raw_data` and the `TensorProto` field which otherwise holds the value.
+SCALAR_FORMATS: dict[int, tuple[str, str]] = {
+    TensorProto.FLOAT: ("<f", "float_data"),
+    TensorProto.BOOL: ("<?", "int32_data"),
+    TensorProto.INT8: ("<b", "int32_data"),
+    TensorProto.INT16: ("<h", "int32_data"),
+    TensorProto.INT32: ("<i", "int32_data"),
+    TensorProto.INT64: ("<q", "int64_data"),
+}
+
+
+def scalar_from_onnx_tensor(
+    tensor: onnx.TensorProto, base_dir: str = ""
+) -> float | int:
+    """
+    Read the value of a single-element ONNX tensor.
+
+    This avoids converting the tensor to an array, for attributes such as
+    the `value` of `ConstantOfShape` which are always a single value.
+
+    :param tensor: The ONNX tensor
+    :param base_dir: Directory that external data locations are relative to
+    """
+    if math.prod(tensor.dims) != 1:
+        raise ValueError("Expected a 1-element tensor")
+
+    if tensor.data_type not in SCALAR_FORMATS:
+        dtype_name = TensorProto.DataType.Name(tensor.data_type)
+        raise ValueError(f"Unsupported tensor data type {dtype_name}")
+    fmt, field = SCALAR_FORMATS[tensor.data_type]
+
+    if tensor.data_location == TensorProto.EXTERNAL:
+        return numpy_helper.to_array(tensor, base_dir).item()
+    elif tensor.HasField("raw_data"):
+        return struct.unpack_from(fmt, tensor.raw_data)[0]
+    else:
+        return getattr(tensor, field)[0]
+
+
+def constant_node_from_onnx_constant_op(
+    onnx_op: onnx.OperatorProto,
+    base_dir: str = "",
+    data_files: Optional[ExternalDataFiles] = None,
+) -> ConstantNode:
     def noop_add_node(node: Node) -> int:
         raise ValueError("Not implemented")
 
@@ -470,7 +739,9 @@ def constant_node_from_onnx_constant_op(onnx_op: onnx.OperatorProto) -> Constant
     tensor = ONNXOperatorReader(
         onnx_op, input_indexes=[], add_node=noop_add_node
     ).require_attr("value", "tensor")
-    const_node = constant_node_from_onnx_initializer(tensor, output_name)
+    const_node = constant_node_from_onnx_initializer(
+        tensor, output_name, base_dir, data_files
+    )
     const_node.name = output_name
 
     return const_node
@@ -530,11 +801,508 @@ def read_dilations(
     return dilations
 
 
+def read_argmax_attrs(op_reader: ONNXOperatorReader) -> sg.ArgMaxAttrsT:
+    attrs = sg.ArgMaxAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", None)
+    attrs.keepDims = bool(op_reader.get_attr("keepdims", "int", 1))
+    op_reader.check_attr("select_last_index", "int", 0)
+    return attrs
+
+
+def read_average_pool_attrs(op_reader: ONNXOperatorReader) -> sg.AveragePoolAttrsT:
+    kernel_shape = op_reader.require_attr("kernel_shape", "ints")
+    check_ints_length("kernel_shape", kernel_shape, 2)
+    pad_mode, pads = read_pads(op_reader)
+    op_reader.check_attr("ceil_mode", "int", 0)
+
+    attrs = sg.AveragePoolAttrsT()
+    attrs.kernelSize = kernel_shape
+    if pads:
+        attrs.pads = pads
+    if pad_mode == "same":
+        attrs.padMode = sg.PadMode.Same
+    else:
+        attrs.padMode = sg.PadMode.Fixed
+    attrs.strides = read_strides(op_reader)
+    attrs.countIncludePad = op_reader.get_bool_attr("count_include_pad", False)
+    return attrs
+
+
+def read_batch_normalization_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.BatchNormalizationAttrsT:
+    attrs = sg.BatchNormalizationAttrsT()
+    attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
+    op_reader.check_attr("training_mode", "int", 0)
+
+    # Ignore attributes which are valid only if training_mode=1, which
+    # is unsupported.
+    op_reader.ignore_attr("momentum")
+    return attrs
+
+
+CAST_TARGET_TYPES: dict[int, int] = {
+    TensorProto.FLOAT: sg.DataType.Float,
+    TensorProto.BOOL: sg.DataType.Int32,
+    TensorProto.INT32: sg.DataType.Int32,
+    TensorProto.INT64: sg.DataType.Int32,
+}
+"""
+Map of ONNX data type to the type used for the output of a `Cast` op.
+"""
+
+
+def read_cast_attrs(op_reader: ONNXOperatorReader) -> sg.CastAttrsT:
+    attrs = sg.CastAttrsT()
+    to = op_reader.get_attr("to", "int", TensorProto.FLOAT)
+    try:
+        attrs.to = CAST_TARGET_TYPES[to]
+    except KeyError:
+        raise Exception(f"Unsupported target type for cast {to}")
+    return attrs
+
+
+def read_clip_attrs(op_reader: ONNXOperatorReader) -> None:
+    op_reader.generate_input_from_attr(1, "min", "float")
+    op_reader.generate_input_from_attr(2, "max", "float")
+
+
+def read_concat_attrs(op_reader: ONNXOperatorReader) -> sg.ConcatAttrsT:
+    attrs = sg.ConcatAttrsT()
+    attrs.axis = op_reader.require_attr("axis", "int")
+    return attrs
+
+
+def read_constant_of_shape_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.ConstantOfShapeAttrsT:
+    tensor = op_reader.require_attr("value", "tensor")
+    try:
+        value = scalar_from_onnx_tensor(tensor, op_reader.base_dir)
+    except ValueError as ex:
+        raise ValueError(f"Unsupported ConstantOfShape value: {ex}")
+
+    scalar: sg.FloatScalarT | sg.IntScalarT
+    if tensor.data_type == TensorProto.FLOAT:
+        scalar_type = sg.Scalar.FloatScalar
+        scalar = sg.FloatScalarT()
+        scalar.value = value
+    else:
+        # Clamp int64 values to the range of the int32 type used in the model,
+        # as for int64 tensors.
+        i32 = np.iinfo(np.int32)
+        if value < i32.min or value > i32.max:
+            warn_once(
+                f"Clamping out-of-range tensor value {value} to [{i32.min}, {i32.max}]"
+            )
+        scalar_type = sg.Scalar.IntScalar
+        scalar = sg.IntScalarT()
+        scalar.value = min(max(int(value), i32.min), i32.max)
+
+    attrs = sg.ConstantOfShapeAttrsT()
+    attrs.valueType = scalar_type
+    attrs.value = scalar
+    return attrs
+
+
+def read_conv_attrs(op_reader: ONNXOperatorReader) -> sg.ConvAttrsT:
+    attrs = sg.ConvAttrsT()
+    attrs.dilations = read_dilations(op_reader)
+    attrs.groups = op_reader.get_attr("group", "int", 1)
+
+    pad_mode, pads = read_pads(op_reader)
+    if pad_mode == "same":
+        attrs.padMode = sg.PadMode.Same
+    else:
+        attrs.padMode = sg.PadMode.Fixed
+        attrs.pads = pads
+    attrs.strides = read_strides(op_reader)
+
+    # The kernel shape is inferred at runtime from the input weight tensor.
+    op_reader.ignore_attr("kernel_shape")
+    return attrs
+
+
+def read_conv_transpose_attrs(op_reader: ONNXOperatorReader) -> sg.ConvTransposeAttrsT:
+    attrs = sg.ConvTransposeAttrsT()
+    attrs.strides = read_strides(op_reader)
+
+    op_reader.check_attr("dilations", "ints", ([1], [1, 1]))
+    op_reader.check_attr("group", "int", 1)
+
+    # The kernel shape is inferred at runtime from the input weight tensor.
+    op_reader.ignore_attr("kernel_shape")
+
+    op_reader.check_attr("output_padding", "ints", [0, 0, 0, 0])
+
+    pad_mode, pads = read_pads(op_reader)
+    if pad_mode == "same":
+        attrs.padMode = sg.PadMode.Same
+    else:
+        attrs.padMode = sg.PadMode.Fixed
+        attrs.pads = pads
+    return attrs
+
+
+def read_cum_sum_attrs(op_reader: ONNXOperatorReader) -> None:
+    op_reader.check_attr("exclusive", "int", 0)
+    op_reader.check_attr("reverse", "int", 0)
+
+
+def read_elu_attrs(op_reader: ONNXOperatorReader) -> sg.EluAttrsT:
+    attrs = sg.EluAttrsT()
+    attrs.alpha = op_reader.get_attr("alpha", "float", 1.0)
+    return attrs
+
+
+def read_flatten_attrs(op_reader: ONNXOperatorReader) -> sg.FlattenAttrsT:
+    attrs = sg.FlattenAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", 1)
+    return attrs
+
+
+def read_gather_attrs(op_reader: ONNXOperatorReader) -> sg.GatherAttrsT:
+    attrs = sg.GatherAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", 0)
+    return attrs
+
+
+def read_gather_nd_attrs(op_reader: ONNXOperatorReader) -> sg.GatherNDAttrsT:
+    attrs = sg.GatherNDAttrsT()
+    attrs.batchDims = op_reader.get_attr("batch_dims", "int", 0)
+    return attrs
+
+
+def read_gemm_attrs(op_reader: ONNXOperatorReader) -> sg.GemmAttrsT:
+    attrs = sg.GemmAttrsT()
+    attrs.alpha = op_reader.get_attr("alpha", "float", 1.0)
+    attrs.beta = op_reader.get_attr("beta", "float", 1.0)
+    attrs.transposeA = bool(op_reader.get_attr("transA", "int", 0))
+    attrs.transposeB = bool(op_reader.get_attr("transB", "int", 0))
+    return attrs
+
+
+def read_gru_attrs(op_reader: ONNXOperatorReader) -> sg.GRUAttrsT:
+    attrs = sg.GRUAttrsT()
+    attrs.direction = op_reader.get_enum_attr("direction", sg.RNNDirection, "forward")
+    attrs.hiddenSize = op_reader.require_attr("hidden_size", "int")
+    attrs.linearBeforeReset = bool(op_reader.get_attr("linear_before_reset", "int", 0))
+    return attrs
+
+
+def read_hard_sigmoid_attrs(op_reader: ONNXOperatorReader) -> sg.HardSigmoidAttrsT:
+    attrs = sg.HardSigmoidAttrsT()
+    attrs.alpha = op_reader.get_attr("alpha", "float", 0.2)
+    attrs.beta = op_reader.get_attr("beta", "float", 0.5)
+    return attrs
+
+
+def read_instance_normalization_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.BatchNormalizationAttrsT:
+    attrs = sg.BatchNormalizationAttrsT()
+    attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
+    return attrs
+
+
+def read_layer_normalization_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.LayerNormalizationAttrsT:
+    attrs = sg.LayerNormalizationAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", -1)
+    attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
+    return attrs
+
+
+def read_leaky_relu_attrs(op_reader: ONNXOperatorReader) -> sg.LeakyReluAttrsT:
+    attrs = sg.LeakyReluAttrsT()
+    attrs.alpha = op_reader.get_attr("alpha", "float", 0.01)
+    return attrs
+
+
+def read_softmax_attrs(op_reader: ONNXOperatorReader) -> sg.SoftmaxAttrsT:
+    attrs = sg.SoftmaxAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", 0)
+    return attrs
+
+
+def read_lstm_attrs(op_reader: ONNXOperatorReader) -> sg.LSTMAttrsT:
+    attrs = sg.LSTMAttrsT()
+    attrs.direction = op_reader.get_enum_attr("direction", sg.RNNDirection, "forward")
+    attrs.hiddenSize = op_reader.require_attr("hidden_size", "int")
+
+    op_reader.check_attr("activation_alpha", "floats", [])
+    op_reader.check_attr("activation_beta", "floats", [])
+    op_reader.check_attr("activations", "strings", [])
+    op_reader.check_attr("clip", "float", 0.0)
+    op_reader.check_attr("input_forget", "int", 0)
+    op_reader.check_attr("layout", "int", 0)
+    return attrs
+
+
+def read_max_pool_attrs(op_reader: ONNXOperatorReader) -> sg.MaxPoolAttrsT:
+    attrs = sg.MaxPoolAttrsT()
+    kernel_shape = op_reader.require_attr("kernel_shape", "ints")
+    check_ints_length("kernel_shape", kernel_shape, 2)
+    attrs.kernelSize = kernel_shape
+
+    pad_mode, pads = read_pads(op_reader)
+    if pad_mode == "same":
+        attrs.padMode = sg.PadMode.Same
+    else:
+        attrs.padMode = sg.PadMode.Fixed
+        attrs.pads = pads
+    attrs.strides = read_strides(op_reader)
+
+    op_reader.check_attr("ceil_mode", "int", 0)
+    op_reader.check_attr("dilations", "ints", ([1], [1, 1]))
+    op_reader.check_attr("storage_order", "int", 0)
+    return attrs
+
+
+def read_mod_attrs(op_reader: ONNXOperatorReader) -> sg.ModAttrsT:
+    attrs = sg.ModAttrsT()
+    attrs.fmod = bool(op_reader.get_attr("fmod", "int", 0))
+    return attrs
+
+
+def read_non_max_suppression_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.NonMaxSuppressionAttrsT:
+    attrs = sg.NonMaxSuppressionAttrsT()
+    center_point_box = op_reader.get_attr("center_point_box", "int", 0)
+    attrs.boxOrder = {
+        0: sg.NMSBoxOrder.TopLeftBottomRight,
+        1: sg.NMSBoxOrder.CenterWidthHeight,
+    }[center_point_box]
+    return attrs
+
+
+def read_one_hot_attrs(op_reader: ONNXOperatorReader) -> sg.OneHotAttrsT:
+    attrs = sg.OneHotAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", -1)
+    return attrs
+
+
+def read_random_normal_common_attrs(
+    op_reader: ONNXOperatorReader,
+    attrs: sg.RandomNormalAttrsT | sg.RandomNormalLikeAttrsT,
+):
+    """Read attributes shared by the RandomNormal and RandomNormalLike operators."""
+    op_reader.check_attr("dtype", "int", 1)
+    attrs.seed = op_reader.get_attr("seed", "float", None)
+    attrs.mean = op_reader.get_attr("mean", "float", 0.0)
+    attrs.scale = op_reader.get_attr("scale", "float", 1.0)
+
+
+def read_random_normal_attrs(op_reader: ONNXOperatorReader) -> sg.RandomNormalAttrsT:
+    attrs = sg.RandomNormalAttrsT()
+    attrs.shape = op_reader.require_attr("shape", "ints")
+    read_random_normal_common_attrs(op_reader, attrs)
+    return attrs
+
+
+def read_random_normal_like_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.RandomNormalLikeAttrsT:
+    attrs = sg.RandomNormalLikeAttrsT()
+    read_random_normal_common_attrs(op_reader, attrs)
+    return attrs
+
+
+def read_random_uniform_common_attrs(
+    op_reader: ONNXOperatorReader,
+    attrs: sg.RandomUniformAttrsT | sg.RandomUniformLikeAttrsT,
+):
+    """Read attributes shared by the RandomUniform and RandomUniformLike operators."""
+    op_reader.check_attr("dtype", "int", 1)
+    attrs.seed = op_reader.get_attr("seed", "float", None)
+    attrs.low = op_reader.get_attr("low", "float", 0.0)
+    attrs.high = op_reader.get_attr("high", "float", 1.0)
+
+
+def read_random_uniform_attrs(op_reader: ONNXOperatorReader) -> sg.RandomUniformAttrsT:
+    attrs = sg.RandomUniformAttrsT()
+    attrs.shape = op_reader.require_attr("shape", "ints")
+    read_random_uniform_common_attrs(op_reader, attrs)
+    return attrs
+
+
+def read_random_uniform_like_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.RandomUniformLikeAttrsT:
+    attrs = sg.RandomUniformLikeAttrsT()
+    read_random_uniform_common_attrs(op_reader, attrs)
+    return attrs
+
+
+def read_reduce_attrs(op_reader: ONNXOperatorReader) -> sg.ReduceMeanAttrsT:
+    attrs = sg.ReduceMeanAttrsT()
+    attrs.axes = op_reader.get_attr("axes", "ints", None)
+    attrs.keepDims = bool(op_reader.get_attr("keepdims", "int", 1))
+
+    op_reader.check_attr("noop_with_empty_axes", "int", 0)
+    return attrs
+
+
+def read_reshape_attrs(op_reader: ONNXOperatorReader) -> sg.ReshapeAttrsT:
+    attrs = sg.ReshapeAttrsT()
+    attrs.allowZero = bool(op_reader.get_attr("allowzero", "int", 0))
+    return attrs
+
+
+def read_resize_attrs(op_reader: ONNXOperatorReader) -> sg.ResizeAttrsT:
+    attrs = sg.ResizeAttrsT()
+    attrs.mode = op_reader.get_enum_attr(
+        "mode", sg.ResizeMode, "nearest", fallback="linear"
+    )
+
+    op_reader.check_attr("antialias", "int", 0)
+
+    # We only support resizing HW dimensions of NCHW tensor
+    op_reader.check_attr("axes", "ints", [2, 3])
+
+    attrs.coordMode = op_reader.get_enum_attr(
+        "coordinate_transformation_mode", sg.CoordTransformMode, "half_pixel"
+    )
+
+    op_reader.check_attr("cubic_coeff_a", "float", -0.75, on_mismatch="warn")
+    op_reader.check_attr("exclude_outside", "int", 0)
+    op_reader.check_attr("extrapolation_value", "float", 0.0)
+    op_reader.check_attr("keep_aspect_ratio_policy", "string", "stretch")
+
+    attrs.nearestMode = op_reader.get_enum_attr(
+        "nearest_mode", sg.NearestMode, "round_prefer_floor"
+    )
+    return attrs
+
+
+def read_pad_attrs(op_reader: ONNXOperatorReader) -> None:
+    op_reader.check_attr("mode", "string", "constant")
+
+
+def read_scatter_elements_attrs(
+    op_reader: ONNXOperatorReader,
+) -> sg.ScatterElementsAttrsT:
+    attrs = sg.ScatterElementsAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", 0)
+    attrs.reduction = op_reader.get_enum_attr("reduction", sg.ScatterReduction, "none")
+    return attrs
+
+
+def read_scatter_nd_attrs(op_reader: ONNXOperatorReader) -> sg.ScatterNDAttrsT:
+    attrs = sg.ScatterNDAttrsT()
+    attrs.reduction = op_reader.get_enum_attr("reduction", sg.ScatterReduction, "none")
+    return attrs
+
+
+def read_shape_attrs(op_reader: ONNXOperatorReader) -> None:
+    op_reader.check_attr("end", "int", 0)
+    op_reader.check_attr("start", "int", 0)
+
+
+def read_split_attrs(op_reader: ONNXOperatorReader) -> sg.SplitAttrsT:
+    attrs = sg.SplitAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", 0)
+    op_reader.check_attr("num_outputs", "int", 0)
+    op_reader.generate_input_from_attr(1, "split", "ints")
+    return attrs
+
+
+def read_squeeze_attrs(op_reader: ONNXOperatorReader) -> None:
+    op_reader.generate_input_from_attr(1, "axes", "ints")
+
+
+def read_top_k_attrs(op_reader: ONNXOperatorReader) -> sg.TopKAttrsT:
+    attrs = sg.TopKAttrsT()
+    attrs.axis = op_reader.get_attr("axis", "int", -1)
+    attrs.largest = bool(op_reader.get_attr("largest", "int", 1))
+    attrs.sorted = bool(op_reader.get_attr("sorted", "int", 1))
+    return attrs
+
+
+def read_transpose_attrs(op_reader: ONNXOperatorReader) -> sg.TransposeAttrsT:
+    attrs = sg.TransposeAttrsT()
+    attrs.perm = op_reader.get_attr("perm", "ints", [])
+    return attrs
+
+
+def read_trilu_attrs(op_reader: ONNXOperatorReader) -> sg.TriluAttrsT:
+    attrs = sg.TriluAttrsT()
+    attrs.upper = bool(op_reader.get_attr("upper", "int", 1))
+    return attrs
+
+
+ATTR_READERS: dict[str, Callable[[ONNXOperatorReader], object | None]] = {
+    "ArgMax": read_argmax_attrs,
+    "ArgMin": read_argmax_attrs,
+    "AveragePool": read_average_pool_attrs,
+    "BatchNormalization": read_batch_normalization_attrs,
+    "Cast": read_cast_attrs,
+    "Clip": read_clip_attrs,
+    "Concat": read_concat_attrs,
+    "ConstantOfShape": read_constant_of_shape_attrs,
+    "Conv": read_conv_attrs,
+    "ConvTranspose": read_conv_transpose_attrs,
+    "CumSum": read_cum_sum_attrs,
+    "Elu": read_elu_attrs,
+    "Flatten": read_flatten_attrs,
+    "Gather": read_gather_attrs,
+    "GatherElements": read_gather_attrs,
+    "GatherND": read_gather_nd_attrs,
+    "Gemm": read_gemm_attrs,
+    "GRU": read_gru_attrs,
+    "HardSigmoid": read_hard_sigmoid_attrs,
+    "InstanceNormalization": read_instance_normalization_attrs,
+    "LayerNormalization": read_layer_normalization_attrs,
+    "LeakyRelu": read_leaky_relu_attrs,
+    "LogSoftmax": read_softmax_attrs,
+    "LSTM": read_lstm_attrs,
+    "MaxPool": read_max_pool_attrs,
+    "Mod": read_mod_attrs,
+    "NonMaxSuppression": read_non_max_suppression_attrs,
+    "OneHot": read_one_hot_attrs,
+    "RandomNormal": read_random_normal_attrs,
+    "RandomNormalLike": read_random_normal_like_attrs,
+    "RandomUniform": read_random_uniform_attrs,
+    "RandomUniformLike": read_random_uniform_like_attrs,
+    "ReduceL2": read_reduce_attrs,
+    "ReduceMax": read_reduce_attrs,
+    "ReduceMean": read_reduce_attrs,
+    "ReduceMin": read_reduce_attrs,
+    "ReduceProd": read_reduce_attrs,
+    "ReduceSum": read_reduce_attrs,
+    "ReduceSumSquare": read_reduce_attrs,
+    "Reshape": read_reshape_attrs,
+    "Resize": read_resize_attrs,
+    "Pad": read_pad_attrs,
+    "ScatterElements": read_scatter_elements_attrs,
+    "ScatterND": read_scatter_nd_attrs,
+    "Shape": read_shape_attrs,
+    "Softmax": read_softmax_attrs,
+    "Split": read_split_attrs,
+    "Squeeze": read_squeeze_attrs,
+    "TopK": read_top_k_attrs,
+    "Transpose": read_transpose_attrs,
+    "Trilu": read_trilu_attrs,
+    "Unsqueeze": read_squeeze_attrs,
+}
+"""
+Map of ONNX operator type to function that checks and converts the operator's
+attributes.
+
+The function returns the attributes object for the RTen operator, or `None` if
+the operator has no attributes. Operators which have no attributes to convert
+or check do not need an entry.
+"""
+
+
 def op_node_from_onnx_operator(
     onnx_op: onnx.OperatorProto,
     node_index_from_name: dict[str, int],
     constant_nodes: dict[str, ConstantNode],
     add_node: Callable[[Node], int],
+    base_dir: str = "",
 ) -> OperatorNode:
     """
     Map an ONNX operator to the equivalent operator in this library.
@@ -549,6 +1317,8 @@ def op_node_from_onnx_operator(
     :param add_node: Function that adds a new node to the graph and returns its
       node ID. This is called if an operator attribute needs to be converted
       to a constant input.
+    :param base_dir: Directory that locations of tensors stored in external
+      files are relative to
     """
     input_indexes = []
     for input_name in onnx_op.input:
@@ -566,13 +1336,17 @@ def op_node_from_onnx_operator(
             index = None
         input_indexes.append(index)
 
-    output_indexes = []
+    output_indexes: list[int | None] = []
     for output_name in onnx_op.output:
-        index = node_index_from_name.get(output_name)
-        if index is None:
-            raise Exception(
-                f'Unable to find output "{output_name}" for operator {onnx_op.name}'
-            )
+        if output_name:
+            index = node_index_from_name.get(output_name)
+            if index is None:
+                raise Exception(
+                    f'Unable to find output "{output_name}" for operator {onnx_op.name}'
+                )
+        else:
+            # An empty output name indicates an omitted optional output.
+            index = None
         output_indexes.append(index)
 
     # Operator attributes. This will be `None` for operators with no attributes,
@@ -582,373 +1356,146 @@ def op_node_from_onnx_operator(
     # Operator type name in RTen models. By default assume this is the same as
     # the ONNX type.
     op_type = onnx_op.op_type
-    op_reader = ONNXOperatorReader(onnx_op, input_indexes, add_node)
+    op_reader = ONNXOperatorReader(onnx_op, input_indexes, add_node, base_dir)
 
     # Check / convert operator attributes and operator name, if different than
     # ONNX.
-    match op_type:
-        case "ArgMax" | "ArgMin":
-            attrs = sg.ArgMaxAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", None)
-            attrs.keepDims = bool(op_reader.get_attr("keepdims", "int", 1))
-            op_reader.check_attr("select_last_index", "int", 0)
-
-        case "AveragePool":
-            kernel_shape = op_reader.require_attr("kernel_shape", "ints")
-            check_ints_length("kernel_shape", kernel_shape, 2)
-            pad_mode, pads = read_pads(op_reader)
-            op_reader.check_attr("ceil_mode", "int", 0)
-
-            attrs = sg.AveragePoolAttrsT()
-            attrs.kernelSize = kernel_shape
-            if pads:
-                attrs.pads = pads
-            if pad_mode == "same":
-                attrs.padMode = sg.PadMode.Same
-            else:
-                attrs.padMode = sg.PadMode.Fixed
-            attrs.strides = read_strides(op_reader)
-            attrs.countIncludePad = op_reader.get_bool_attr("count_include_pad", False)
-
-        case "BatchNormalization":
-            attrs = sg.BatchNormalizationAttrsT()
-            attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
-            op_reader.check_attr("training_mode", "int", 0)
-
-            # Ignore attributes which are valid only if training_mode=1, which
-            # is unsupported.
-            op_reader.ignore_attr("momentum")
-
-        case "Cast":
-            attrs = sg.CastAttrsT()
-            to = op_reader.get_attr("to", "int", TensorProto.DataType.FLOAT)  # type:ignore[attr-defined]
-            match to:
-                case TensorProto.DataType.FLOAT:  # type:ignore[attr-defined]
-                    attrs.to = sg.DataType.Float
-                case (
-                    TensorProto.DataType.BOOL  # type:ignore[attr-defined]
-                    | TensorProto.DataType.INT32  # type:ignore[attr-defined]
-                    | TensorProto.DataType.INT64  # type:ignore[attr-defined]
-                ):
-                    attrs.to = sg.DataType.Int32
-                case _:
-                    raise Exception(f"Unsupported target type for cast {to}")
-
-        case "Clip":
-            op_reader.generate_input_from_attr(1, "min", "float")
-            op_reader.generate_input_from_attr(2, "max", "float")
-
-        case "Concat":
-            attrs = sg.ConcatAttrsT()
-            attrs.axis = op_reader.require_attr("axis", "int")
-
-        case "ConstantOfShape":
-            tensor = op_reader.require_attr("value", "tensor")
-            const_node = constant_node_from_onnx_initializer(tensor, onnx_op.name)
-
-            if len(const_node.data) != 1:
-                raise Exception(
-                    "Expected ConstantOfShape value to be a 1-element tensor"
-                )
-
-            scalar: sg.FloatScalarT | sg.IntScalarT
-            if const_node.data.dtype == np.float32:
-                scalar_type = sg.Scalar.FloatScalar
-                scalar = sg.FloatScalarT()
-                scalar.value = const_node.data.item()
-            elif const_node.data.dtype == np.int32:
-                scalar_type = sg.Scalar.IntScalar
-                scalar = sg.IntScalarT()
-                scalar.value = const_node.data.item()
-            else:
-                raise ValueError(
-                    f"Unsupported value type {const_node.data.dtype.name} for ConstantOfShape"
-                )
+    read_attrs = ATTR_READERS.get(op_type)
+    if read_attrs:
+        attrs = read_attrs(op_reader)
 
-            attrs = sg.ConstantOfShapeAttrsT()
-            attrs.valueType = scalar_type
-            attrs.value = scalar
-
-        case "Conv":
-            attrs = sg.ConvAttrsT()
-            attrs.dilations = read_dilations(op_reader)
-            attrs.groups = op_reader.get_attr("group", "int", 1)
-
-            pad_mode, pads = read_pads(op_reader)
-            if pad_mode == "same":
-                attrs.padMode = sg.PadMode.Same
-            else:
-                attrs.padMode = sg.PadMode.Fixed
-                attrs.pads = pads
-            attrs.strides = read_strides(op_reader)
-
-            # The kernel shape is inferred at runtime from the input weight tensor.
-            op_reader.ignore_attr("kernel_shape")
-
-        case "ConvTranspose":
-            attrs = sg.ConvTransposeAttrsT()
-            attrs.strides = read_strides(op_reader)
-
-            op_reader.check_attr("dilations", "ints", ([1], [1, 1]))
-            op_reader.check_attr("group", "int", 1)
-
-            # The kernel shape is inferred at runtime from the input weight tensor.
-            op_reader.ignore_attr("kernel_shape")
-
-            op_reader.check_attr("output_padding", "ints", [0, 0, 0, 0])
+    if op_type not in OPERATOR_TYPES:
+        raise Exception(f"Unsupported operator {op_type}")
 
-            pad_mode, pads = read_pads(op_reader)
-            if pad_mode == "same":
-                attrs.padMode = sg.PadMode.Same
-            else:
-                attrs.padMode = sg.PadMode.Fixed
-                attrs.pads = pads
-
-        case "CumSum":
-            op_reader.check_attr("exclusive", "int", 0)
-            op_reader.check_attr("reverse", "int", 0)
-
-        case "Elu":
-            attrs = sg.EluAttrsT()
-            attrs.alpha = op_reader.get_attr("alpha", "float", 1.0)
-
-        case "Flatten":
-            attrs = sg.FlattenAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 1)
-
-        case "Gather" | "GatherElements":
-            attrs = sg.GatherAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 0)
-
-        case "GatherND":
-            attrs = sg.GatherNDAttrsT()
-            attrs.batchDims = op_reader.get_attr("batch_dims", "int", 0)
-
-        case "Gemm":
-            attrs = sg.GemmAttrsT()
-            attrs.alpha = op_reader.get_attr("alpha", "float", 1.0)
-            attrs.beta = op_reader.get_attr("beta", "float", 1.0)
-            attrs.transposeA = bool(op_reader.get_attr("transA", "int", 0))
-            attrs.transposeB = bool(op_reader.get_attr("transB", "int", 0))
-
-        case "GRU":
-            attrs = sg.GRUAttrsT()
-            attrs.direction = op_reader.get_enum_attr(
-                "direction", sg.RNNDirection, "forward"
-            )
-            attrs.hiddenSize = op_reader.require_attr("hidden_size", "int")
-            attrs.linearBeforeReset = bool(
-                op_reader.get_attr("linear_before_reset", "int", 0)
-            )
+    # Display a warning for any attributes that were not handled above.
+    for attr in op_reader.unhandled_attrs():
+        warn_once(
+            f"WARNING: Unsupported attribute {attr.name} for operator {onnx_op.op_type}"
+        )
 
-        case "HardSigmoid":
-            attrs = sg.HardSigmoidAttrsT()
-            attrs.alpha = op_reader.get_attr("alpha", "float", 0.2)
-            attrs.beta = op_reader.get_attr("beta", "float", 0.5)
+    return OperatorNode(
+        name=onnx_op.name,
+        op_type=op_type,
+        attrs=attrs,
+        inputs=op_reader.input_indexes,
+        outputs=cast(list[int | None], output_indexes),
+    )
 
-        case "InstanceNormalization":
-            attrs = sg.BatchNormalizationAttrsT()
-            attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
 
-        case "LayerNormalization":
-            attrs = sg.LayerNormalizationAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", -1)
-            attrs.epsilon = op_reader.get_attr("epsilon", "float", 1e-5)
+def fold_gather(inputs: list[np.ndarray], attrs: dict[str, Any]) -> np.ndarray:
+    data, indices = inputs
+    return np.take(data, indices, axis=attrs.get("axis", 0))
 
-        case "LeakyRelu":
-            attrs = sg.LeakyReluAttrsT()
-            attrs.alpha = op_reader.get_attr("alpha", "float", 0.01)
 
-        case "LogSoftmax":
-            attrs = sg.SoftmaxAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 0)
+def fold_reshape(inputs: list[np.ndarray], attrs: dict[str, Any]) -> np.ndarray:
+    data, shape = inputs
+    sizes = [int(size) for size in shape]
+    if not attrs.get("allowzero", 0):
+        # Zeros in the shape copy the size of the corresponding input dim.
+        sizes = [data.shape[i] if size == 0 else size for i, size in enumerate(sizes)]
+    return data.reshape(sizes)
 
-        case "LSTM":
-            attrs = sg.LSTMAttrsT()
-            attrs.direction = op_reader.get_enum_attr(
-                "direction", sg.RNNDirection, "forward"
-            )
-            attrs.hiddenSize = op_reader.require_attr("hidden_size", "int")
-
-            op_reader.check_attr("activation_alpha", "floats", [])
-            op_reader.check_attr("activation_beta", "floats", [])
-            op_reader.check_attr("activations", "strings", [])
-            op_reader.check_attr("clip", "float", 0.0)
-            op_reader.check_attr("input_forget", "int", 0)
-            op_reader.check_attr("layout", "int", 0)
-
-        case "MaxPool":
-            attrs = sg.MaxPoolAttrsT()
-            kernel_shape = op_reader.require_attr("kernel_shape", "ints")
-            check_ints_length("kernel_shape", kernel_shape, 2)
-            attrs.kernelSize = kernel_shape
-
-            pad_mode, pads = read_pads(op_reader)
-            if pad_mode == "same":
-                attrs.padMode = sg.PadMode.Same
-            else:
-                attrs.padMode = sg.PadMode.Fixed
-                attrs.pads = pads
-            attrs.strides = read_strides(op_reader)
-
-            op_reader.check_attr("ceil_mode", "int", 0)
-            op_reader.check_attr("dilations", "ints", ([1], [1, 1]))
-            op_reader.check_attr("storage_order", "int", 0)
-
-        case "Mod":
-            attrs = sg.ModAttrsT()
-            attrs.fmod = bool(op_reader.get_attr("fmod", "int", 0))
-
-        case "NonMaxSuppression":
-            attrs = sg.NonMaxSuppressionAttrsT()
-            center_point_box = op_reader.get_attr("center_point_box", "int", 0)
-            attrs.boxOrder = {
-                0: sg.NMSBoxOrder.TopLeftBottomRight,
-                1: sg.NMSBoxOrder.CenterWidthHeight,
-            }[center_point_box]
-
-        case "OneHot":
-            attrs = sg.OneHotAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", -1)
-
-        case "RandomNormal" | "RandomNormalLike":
-            match op_type:
-                case "RandomNormal":
-                    attrs = sg.RandomNormalAttrsT()
-                    attrs.shape = op_reader.require_attr("shape", "ints")
-                case "RandomNormalLike":
-                    attrs = sg.RandomNormalLikeAttrsT()
-
-            op_reader.check_attr("dtype", "int", 1)
-            attrs.seed = op_reader.get_attr("seed", "float", None)
-            attrs.mean = op_reader.get_attr("mean", "float", 0.0)
-            attrs.scale = op_reader.get_attr("scale", "float", 1.0)
-
-        case "RandomUniform" | "RandomUniformLike":
-            match op_type:
-                case "RandomUniform":
-                    attrs = sg.RandomUniformAttrsT()
-                    attrs.shape = op_reader.require_attr("shape", "ints")
-                case "RandomUniformLike":
-                    attrs = sg.RandomUniformLikeAttrsT()
-
-            op_reader.check_attr("dtype", "int", 1)
-            attrs.seed = op_reader.get_attr("seed", "float", None)
-            attrs.low = op_reader.get_attr("low", "float", 0.0)
-            attrs.high = op_reader.get_attr("high", "float", 1.0)
-
-        case (
-            "ReduceL2"
-            | "ReduceMax"
-            | "ReduceMean"
-            | "ReduceMin"
-            | "ReduceProd"
-            | "ReduceSum"
-            | "ReduceSumSquare"
-        ):
-            attrs = sg.ReduceMeanAttrsT()
-            attrs.axes = op_reader.get_attr("axes", "ints", None)
-            attrs.keepDims = bool(op_reader.get_attr("keepdims", "int", 1))
 
-            op_reader.check_attr("noop_with_empty_axes", "int", 0)
+def fold_squeeze(inputs: list[np.ndarray], attrs: dict[str, Any]) -> np.ndarray:
+    axes = inputs[1] if len(inputs) > 1 else attrs.get("axes")
+    if axes is None:
+        return np.squeeze(inputs[0])
+    return np.squeeze(inputs[0], axis=tuple(int(axis) for axis in axes))
 
-        case "Reshape":
-            attrs = sg.ReshapeAttrsT()
-            attrs.allowZero = bool(op_reader.get_attr("allowzero", "int", 0))
 
-        case "Resize":
-            attrs = sg.ResizeAttrsT()
-            attrs.mode = op_reader.get_enum_attr(
-                "mode", sg.ResizeMode, "nearest", fallback="linear"
-            )
+def fold_unsqueeze(inputs: list[np.ndarray], attrs: dict[str, Any]) -> np.ndarray:
+    axes = inputs[1] if len(inputs) > 1 else attrs["axes"]
+    return np.expand_dims(inputs[0], axis=tuple(int(axis) for axis in axes))
 
-            op_reader.check_attr("antialias", "int", 0)
 
-            # We only support resizing HW dimensions of NCHW tensor
-            op_reader.check_attr("axes", "ints", [2, 3])
+CONSTANT_FOLDERS: dict[
+    str, Callable[[list[np.ndarray], dict[str, Any]], np.ndarray]
+] = {
+    "Concat": lambda inputs, attrs: np.concatenate(inputs, axis=attrs["axis"]),
+    "Gather": fold_gather,
+    "Reshape": fold_reshape,
+    "Shape": lambda inputs, attrs: np.array(
+        inputs[0].shape[attrs.get("start", 0) : attrs.get("end")], dtype=np.int32
+    ),
+    "Squeeze": fold_squeeze,
+    "Unsqueeze": fold_unsqueeze,
+}
+"""
+Map of ONNX operator name to function which evaluates the operator, given
+its inputs and attributes.
 
-            attrs.coordMode = op_reader.get_enum_attr(
-                "coordinate_transformation_mode", sg.CoordTransformMode, "half_pixel"
-            )
+These are operators which are commonly used to compute shapes, and whose
+inputs are often all constants.
+"""
 
-            op_reader.check_attr("cubic_coeff_a", "float", -0.75, on_mismatch="warn")
-            op_reader.check_attr("exclude_outside", "int", 0)
-            op_reader.check_attr("extrapolation_value", "float", 0.0)
-            op_reader.check_attr("keep_aspect_ratio_policy", "string", "stretch")
 
-            attrs.nearestMode = op_reader.get_enum_attr(
-                "nearest_mode", sg.NearestMode, "round_prefer_floor"
-            )
+def fold_constants(
+    operators: list[onnx.NodeProto], constants: list[ConstantNode], keep: set[str]
+) -> tuple[list[onnx.NodeProto], list[ConstantNode]]:
+    """
+    Evaluate operators whose inputs are all constants at conversion time.
 
-        case "Pad":
-            op_reader.check_attr("mode", "string", "constant")
+    The outputs of these operators are replaced with constants. Constants
+    which were only used by evaluated operators are removed.
 
-        case "ScatterElements":
-            attrs = sg.ScatterElementsAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 0)
-            attrs.reduction = op_reader.get_enum_attr(
-                "reduction", sg.ScatterReduction, "none"
-            )
+    :param operators: Operators in topological order
+    :param constants: Constants used by the operators
+    :param keep: Names of values which must not be replaced or removed (eg.
+      graph inputs and outputs)
+    :return: Tuple of remaining operators and constants
+    """
+    values = {constant.name: constant.data for constant in constants}
+    remaining: list[onnx.NodeProto] = []
+    folded_inputs: set[str] = set()
+
+    for operator in operators:
+        fold = CONSTANT_FOLDERS.get(operator.op_type)
+        inputs = [values.get(name) for name in operator.input]
+        if (
+            fold is None
+            or any(input_ is None for input_ in inputs)
+            or any(name in keep for name in operator.output)
+        ):
+            remaining.append(operator)
+            continue
 
-        case "ScatterND":
-            attrs = sg.ScatterNDAttrsT()
-            attrs.reduction = op_reader.get_enum_attr(
-                "reduction", sg.ScatterReduction, "none"
+        try:
+            attrs = {
+                attr.name: onnx.helper.get_attribute_value(attr)
+                for attr in operator.attribute
+            }
+            output = fold(cast(list[np.ndarray], inputs), attrs)
+        except (IndexError, KeyError, ValueError) as ex:
+            # These are raised by NumPy if the inputs are invalid for the
+            # operator, or by the folder if a required attribute is missing.
+            # Leave the operator for the runtime to evaluate, and report
+            # any errors then.
+            warn_once(
+                f"Unable to fold {operator.op_type} operator {operator.name}: {ex}"
             )
+            remaining.append(operator)
+            continue
 
-        case "Shape":
-            op_reader.check_attr("end", "int", 0)
-            op_reader.check_attr("start", "int", 0)
-
-        case "Softmax":
-            attrs = sg.SoftmaxAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 0)
-
-        case "Split":
-            attrs = sg.SplitAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", 0)
-            op_reader.check_attr("num_outputs", "int", 0)
-            op_reader.generate_input_from_attr(1, "split", "ints")
-
-        case "Squeeze":
-            op_reader.generate_input_from_attr(1, "axes", "ints")
-
-        case "TopK":
-            attrs = sg.TopKAttrsT()
-            attrs.axis = op_reader.get_attr("axis", "int", -1)
-            attrs.largest = bool(op_reader.get_attr("largest", "int", 1))
-            attrs.sorted = bool(op_reader.get_attr("sorted", "int", 1))
-
-        case "Transpose":
-            attrs = sg.TransposeAttrsT()
-            attrs.perm = op_reader.get_attr("perm", "ints", [])
+        if output.dtype not in (np.float32, np.int32):
+            remaining.append(operator)
+            continue
 
-        case "Trilu":
-            attrs = sg.TriluAttrsT()
-            attrs.upper = bool(op_reader.get_attr("upper", "int", 1))
+        output_name = operator.output[0]
+        values[output_name] = output
+        constants.append(ConstantNode(output_name, list(output.shape), output))
+        folded_inputs.update(operator.input)
+        folded_inputs.add(output_name)
 
-        case "Unsqueeze":
-            op_reader.generate_input_from_attr(1, "axes", "ints")
+    used = keep.union(*(operator.input for operator in remaining))
+    constants = [
+        constant
+        for constant in constants
+        if constant.name in used or constant.name not in folded_inputs
+    ]
+    return remaining, constants
 
-    if not hasattr(sg.OperatorType, op_type):
-        raise Exception(f"Unsupported operator {op_type}")
 
-    # Display a warning for any attributes that were not handled above.
-    for attr in op_reader.unhandled_attrs():
-        warn_once(
-            f"WARNING: Unsupported attribute {attr.name} for operator {onnx_op.op_type}"
-        )
-
-    return OperatorNode(
-        name=onnx_op.name,
-        op_type=op_type,
-        attrs=attrs,
-        inputs=op_reader.input_indexes,
-        outputs=cast(list[int | None], output_indexes),
-    )
-
-
-def duplicate_node_names(nodes: list[onnx.ValueInfoProto]) -> list[str]:
+def duplicate_node_names(nodes: Sequence[onnx.ValueInfoProto | Node]) -> list[str]:
     """
     Check for node names which are duplicated in `nodes` and return the
     duplicates.
@@ -961,10 +1508,25 @@ def duplicate_node_names(nodes: list[onnx.ValueInfoProto]) -> list[str]:
     return dupes
 
 
-def graph_from_onnx_graph(onnx_graph: onnx.GraphProto) -> Graph:
+def graph_from_onnx_graph(
+    onnx_graph: onnx.GraphProto,
+    base_dir: str = "",
+    data_files: Optional[ExternalDataFiles] = None,
+) -> Graph:
     """
     Parse an ONNX model into a graph representation compatible with this library.
+
+    :param onnx_graph: The ONNX graph
+    :param base_dir: Directory that locations of tensors stored in external
+      files are relative to. This is normally the directory containing the
+      ONNX model.
+    :param data_files: Mappings of external data files. Constants with
+      external data reference these mappings, so they should be closed once
+      the graph has been serialized. If not provided, the mappings are closed
+      when the graph is freed.
     """
+    if data_files is None:
+        data_files = ExternalDataFiles()
 
     nodes: list[Node] = []
 
@@ -989,21 +1551,45 @@ def graph_from_onnx_graph(onnx_graph: onnx.GraphProto) -> Graph:
         return node_index
 
     conversion_errors = 0
+    constants: list[ConstantNode] = []
 
-    for tensor in onnx_graph.initializer:
+    def convert_initializer(tensor: onnx.TensorProto) -> ConstantNode | Exception:
         try:
-            const_node = constant_node_from_onnx_initializer(tensor, None)
-            add_node(const_node)
+            constant = constant_node_from_onnx_initializer(
+                tensor, None, base_dir, data_files
+            )
         except Exception as ex:
-            warn_once(f"Error converting initializer: {ex}")
-            conversion_errors += 1
+            return ex
+
+        # Lay out the data as it will be serialized here, so that any copy
+        # happens in parallel and serializing the model is just a memcpy.
+        constant.data = serialized_layout(constant.data)
+        return constant
+
+    # Converting initializers is dominated by NumPy operations which release
+    # the GIL (eg. narrowing int64 data, reading memory-mapped external data),
+    # so convert them in parallel. Threads are used rather than processes to
+    # avoid pickling every tensor to send it back to the main process.
+    with ThreadPoolExecutor() as executor:
+        for result in executor.map(convert_initializer, onnx_graph.initializer):
+            if isinstance(result, Exception):
+                warn_once(f"Error converting initializer: {result}")
+                conversion_errors += 1
+            else:
+                constants.append(result)
+
+    # Operators other than `Constant`, which are converted after all constants
+    # and graph inputs and outputs have been registered.
+    operators: list[onnx.NodeProto] = []
 
     for operator in onnx_graph.node:
         if operator.op_type != "Constant":
+            operators.append(operator)
             continue
         try:
-            const_node = constant_node_from_onnx_constant_op(operator)
-            add_node(const_node)
+            constants.append(
+                constant_node_from_onnx_constant_op(operator, base_dir, data_files)
+            )
         except Exception as ex:
             warn_once(f'Error converting "Constant" operator: {ex}')
             conversion_errors += 1
@@ -1015,42 +1601,54 @@ def graph_from_onnx_graph(onnx_graph: onnx.GraphProto) -> Graph:
             f"Errors occurred when converting {conversion_errors} constants"
         )
 
-    def add_value_node(value: ValueInfoProto):
-        # If the same node is referenced in at 2 or more of:
-        #
-        # - The initializer list
-        # - The input list
-        # - The output list
-        #
-        # Then we only keep the first definition seen.
-        if value.name in value_name_to_index:
-            return
-        value_node = value_node_from_onnx_value(value)
-        add_node(value_node)
-
-    for value_info in onnx_graph.input:
-        add_value_node(value_info)
-
-    for value_info in onnx_graph.output:
-        add_value_node(value_info)
+    # Evaluate operators that only depend on constants (eg. shape
+    # computations), so that the runtime doesn't have to.
+    operators, constants = fold_constants(
+        operators,
+        constants,
+        keep={info.name for info in chain(onnx_graph.input, onnx_graph.output)},
+    )
 
-    for operator in onnx_graph.node:
-        if operator.op_type == "Constant":
+    # Register all the constants at once. Constant names are checked for
+    # conflicts in bulk, rather than as each node is added.
+    nodes.extend(constants)
+    constant_map.update((node.name, node) for node in constants)
+    value_name_to_index.update((node.name, i) for i, node in enumerate(constants))
+    if len(value_name_to_index) != len(constants):
+        dupes = duplicate_node_names(constants)
+        raise ValueError(f'Node name "{dupes[0]}" conflicts with another node')
+
+    # If the same node is referenced in at 2 or more of:
+    #
+    # - The initializer list
+    # - The input list
+    # - The output list
+    #
+    # Then we only keep the first definition seen.
+    for value_info in chain(onnx_graph.input, onnx_graph.output):
+        if value_info.name in value_name_to_index:
             continue
+        value_name_to_index[value_info.name] = len(nodes)
+        nodes.append(value_node_from_onnx_value(value_info))
 
+    for operator in operators:
         for output_name in operator.output:
             # If this output is also a model output, it will have been
-            # registered already.
-            if output_name in value_name_to_index:
+            # registered already. Empty names are omitted optional outputs.
+            if not output_name or output_name in value_name_to_index:
                 continue
-            value_node = ValueNode(output_name, shape=None)
-            add_node(value_node)
+            value_name_to_index[output_name] = len(nodes)
+            nodes.append(ValueNode(output_name, shape=None))
 
         try:
             op_node = op_node_from_onnx_operator(
-                operator, value_name_to_index, constant_map, add_node=add_node
+                operator,
+                value_name_to_index,
+                constant_map,
+                add_node=add_node,
+                base_dir=base_dir,
             )
-            add_node(op_node)
+            nodes.append(op_node)
         except Exception as ex:
             print(
                 f"Error converting {operator.op_type} operator {operator.name}: {ex}",
@@ -1080,17 +1678,46 @@ def graph_from_onnx_graph(onnx_graph: onnx.GraphProto) -> Graph:
     return Graph(nodes=nodes, inputs=inputs, outputs=outputs)
 
 
-def build_constant_node(builder: flatbuffers.Builder, constant: ConstantNode):
+TENSOR_DATA_ALIGNMENT = 64
+"""
+Alignment in bytes of the data for constant tensors in serialized models.
+"""
+
+
+def build_constant_node(
+    builder: flatbuffers.Builder,
+    constant: ConstantNode,
+    data_vecs: Optional[dict[bytes, int]] = None,
+):
     """
     Serialize a constant tensor value (eg. model weights) into a FlatBuffers model.
+
+    :param data_vecs: Map of digest of tensor data to the offset of a vector
+      containing that data. If provided, this is used to serialize the data
+      of tensors with identical contents only once.
     """
-    shape_vec = write_vec(
-        builder, sg.ConstantNodeStartShapeVector, constant.shape, "u32"
-    )
+    shape_vec = write_vec(builder, constant.shape, "u32")
 
-    # Convert data to NumPy array then serialize. This is much faster than
-    # serializing a Python array element by element.
-    data_vec = builder.CreateNumpyVector(constant.data.flatten())
+    # Align tensor data to a cache line, so that the runtime can use aligned
+    # SIMD loads when reading it in place. Small tensors are left with their
+    # natural alignment to avoid the padding overhead.
+    if constant.data.nbytes >= TENSOR_DATA_ALIGNMENT:
+        alignment = TENSOR_DATA_ALIGNMENT
+    else:
+        alignment = constant.data.dtype.alignment
+
+    if data_vecs is not None:
+        data = serialized_layout(constant.data)
+        digest = hashlib.sha256(data.dtype.str.encode())
+        digest.update(data.reshape(-1).data.cast("B"))
+        key = digest.digest()
+
+        data_vec = data_vecs.get(key)
+        if data_vec is None:
+            data_vec = write_array(builder, data, alignment)
+            data_vecs[key] = data_vec
+    else:
+        data_vec = write_array(builder, constant.data, alignment)
 
     match constant.data.dtype:
         case np.float32:
@@ -1113,29 +1740,76 @@ def build_constant_node(builder: flatbuffers.Builder, constant: ConstantNode):
     return sg.ConstantNodeEnd(builder)
 
 
+def serialized_layout(array: np.ndarray) -> np.ndarray:
+    """
+    Return an array with the memory layout of a FlatBuffers vector.
+
+    Vector elements are stored contiguously in little-endian order. This is a
+    no-op for arrays which already have that layout (the common case).
+    """
+    return np.asarray(array, dtype=array.dtype.newbyteorder("<"), order="C")
+
+
+def write_array(
+    builder: flatbuffers.Builder, array: np.ndarray, alignment: Optional[int] = None
+):
+    """
+    Serialize a NumPy array into a vector in a FlatBuffers buffer.
+
+    Unlike `Builder.CreateNumpyVector`, this copies the array's elements
+    straight into the buffer, instead of first copying them into a temporary
+    `bytes` object. For large weights that avoids a transient copy of the
+    whole tensor.
+
+    :param alignment: Alignment of the vector's elements, relative to the
+      start of the buffer. Defaults to the alignment of the array's dtype.
+    """
+    array = serialized_layout(array)
+
+    data = array.reshape(-1).data.cast("B")
+
+    if alignment is None:
+        alignment = array.dtype.alignment
+    builder.StartVector(array.itemsize, array.size, alignment)
+    builder.head -= len(data)
+    builder.Bytes[builder.head : builder.head + len(data)] = data
+    return builder.EndVector()
+
+
 def write_vec(
     builder: flatbuffers.Builder,
-    start_vec,
-    data: list[int],
+    data: Sequence[int],
     dtype: Literal["u32", "i32", "offset"],
 ):
     """
     Serialize a list into a vector in a FlatBuffers buffer.
 
-    `start_vec` is the generated function that starts the vector.
-    """
-    start_vec(builder, len(data))
-    for item in reversed(data):
-        match dtype:
-            case "u32":
-                builder.PrependUint32(item)
-            case "i32":
-                builder.PrependInt32(item)
-            case "offset":
-                builder.PrependUOffsetTRelative(item)
-            case _:
-                raise ValueError("Unsupported data type")
-    return builder.EndVector()
+    All the elements are copied into the buffer at once, rather than being
+    prepended one at a time.
+    """
+    match dtype:
+        case "u32":
+            return write_array(builder, np.asarray(data, dtype=np.uint32))
+        case "i32":
+            return write_array(builder, np.asarray(data, dtype=np.int32))
+        case "offset":
+            builder.StartVector(4, len(data), 4)
+
+            # Offsets are stored relative to the location of each element, so
+            # compute where each element will be written, measured from the
+            # end of the buffer like `builder.Offset()`.
+            positions = builder.Offset() + 4 * np.arange(len(data), 0, -1)
+            elems = (positions - np.asarray(data, dtype=np.int64)).astype("<u4")
+
+            # `StartVector` has already reserved and aligned space for the
+            # vector's contents.
+            builder.head -= elems.nbytes
+            builder.Bytes[builder.head : builder.head + elems.nbytes] = elems.data.cast(
+                "B"
+            )
+            return builder.EndVector()
+        case _:
+            raise ValueError("Unsupported data type")
 
 
 def build_operator_node(builder: flatbuffers.Builder, operator: OperatorNode):
@@ -1143,48 +1817,54 @@ def build_operator_node(builder: flatbuffers.Builder, operator: OperatorNode):
     Serialize an operator into a FlatBuffers model.
     """
 
+    # The table is built with the builder functions rather than
+    # `OperatorNodeT.Pack`, which prepends input and output IDs one at a time.
     if operator.attrs:
-        # Given an `operator.attrs` which is an instance of `SomeOpAttrsT`,
-        # find the `sg.OperatorAttrs.SomeOpAttrs` constant.
-        attrs_const_name = operator.attrs.__class__.__name__[:-1]
-        attrs_type = getattr(sg.OperatorAttrs, attrs_const_name)
+        attrs_type = OPERATOR_ATTRS_TYPES[type(operator.attrs)]
+        attrs = operator.attrs.Pack(builder)
     else:
         attrs_type = sg.OperatorAttrs.NONE
-
-    operator_table = sg.OperatorNodeT()
-    operator_table.type = getattr(sg.OperatorType, operator.op_type)
-
-    operator_table.attrsType = attrs_type
-    operator_table.attrs = operator.attrs
+        attrs = None
 
     def node_id(maybe_id: int | None) -> int:
         if maybe_id is None:
             return -1
         return maybe_id
 
-    operator_table.inputs = [node_id(id_) for id_ in operator.inputs]
-    operator_table.outputs = [node_id(id_) for id_ in operator.outputs]
-    return operator_table.Pack(builder)
+    inputs = write_vec(builder, [node_id(id_) for id_ in operator.inputs], "i32")
+    outputs = write_vec(builder, [node_id(id_) for id_ in operator.outputs], "i32")
 
+    sg.OperatorNodeStart(builder)
+    sg.OperatorNodeAddType(builder, OPERATOR_TYPES[operator.op_type])
+    sg.OperatorNodeAddAttrsType(builder, attrs_type)
+    if attrs is not None:
+        sg.OperatorNodeAddAttrs(builder, attrs)
+    sg.OperatorNodeAddInputs(builder, inputs)
+    sg.OperatorNodeAddOutputs(builder, outputs)
+    return sg.OperatorNodeEnd(builder)
 
-def build_value_node(builder: flatbuffers.Builder, value: ValueNode):
+
+def build_dim(builder: flatbuffers.Builder, dim: str | int) -> int:
     """
-    Serialize a placeholder for an input/output value into a FlatBuffers model.
+    Serialize a symbolic or fixed-size dimension of a value's shape.
     """
+    if isinstance(dim, str):
+        name = builder.CreateSharedString(dim)
+        sg.DimStart(builder)
+        sg.DimAddName(builder, name)
+    else:
+        sg.DimStart(builder)
+        sg.DimAddValue(builder, dim)
+    return sg.DimEnd(builder)
 
-    def write_dim(builder, dim: str | int) -> int:
-        if isinstance(dim, str):
-            name = builder.CreateString(dim)
-            sg.DimStart(builder)
-            sg.DimAddName(builder, name)
-        else:
-            sg.DimStart(builder)
-            sg.DimAddValue(builder, dim)
-        return sg.DimEnd(builder)
 
+def build_value_node(builder: flatbuffers.Builder, value: ValueNode):
+    """
+    Serialize a placeholder for an input/output value into a FlatBuffers model.
+    """
     if value.shape is not None:
-        dims = [write_dim(builder, dim) for dim in value.shape]
-        shape_vec = write_vec(builder, sg.ValueNodeStartShapeVector, dims, "offset")
+        dims = [build_dim(builder, dim) for dim in value.shape]
+        shape_vec = write_vec(builder, dims, "offset")
     else:
         shape_vec = None
 
@@ -1232,22 +1912,44 @@ def build_graph(builder: flatbuffers.Builder, graph: Graph):
     """
     Serialize a computation graph into a flatbuffers model.
     """
-    node_offsets = []
-    for node in graph.nodes:
-        match node:
-            case ConstantNode():
-                data_type = sg.NodeKind.ConstantNode
-                data = build_constant_node(builder, node)
-            case OperatorNode():
-                data_type = sg.NodeKind.OperatorNode
-                data = build_operator_node(builder, node)
-            case ValueNode():
-                data_type = sg.NodeKind.ValueNode
-                data = build_value_node(builder, node)
-            case _:
-                raise Exception("Unsupported node type")
+    # Offsets are stored unboxed, since graphs can have many thousands of
+    # nodes. `write_vec` reads them via the buffer protocol.
+    node_offsets = array("I")
+
+    # Models often contain several constants with identical contents (eg.
+    # masks or zero-filled tensors), so the data for these is shared.
+    #
+    # Finding duplicates requires hashing the data, so this is only done for
+    # constants whose data type and size match at least one other constant.
+    data_vecs: dict[bytes, int] = {}
+    data_sizes = Counter(
+        (node.data.dtype, node.data.nbytes)
+        for node in graph.nodes
+        if isinstance(node, ConstantNode)
+    )
+
+    def build_constant(constant: ConstantNode) -> int:
+        if data_sizes[(constant.data.dtype, constant.data.nbytes)] > 1:
+            return build_constant_node(builder, constant, data_vecs)
+        return build_constant_node(builder, constant)
+
+    # Map of node class to node kind and function which serializes the node.
+    node_builders: dict[type[Node], tuple[int, Callable[[Any], int]]] = {
+        ConstantNode: (sg.NodeKind.ConstantNode, build_constant),
+        OperatorNode: (sg.NodeKind.OperatorNode, partial(build_operator_node, builder)),
+        ValueNode: (sg.NodeKind.ValueNode, partial(build_value_node, builder)),
+    }
 
-        name_str = builder.CreateString(node.name)
+    for node in graph.nodes:
+        try:
+            data_type, build_node = node_builders[type(node)]
+        except KeyError:
+            raise Exception("Unsupported node type")
+        data = build_node(node)
+
+        # Names are often repeated (eg. unnamed operators all have an empty
+        # name), so only serialize each distinct name once.
+        name_str = builder.CreateSharedString(node.name)
         sg.NodeStart(builder)
         sg.NodeAddName(builder, name_str)
         sg.NodeAddDataType(builder, data_type)
@@ -1255,9 +1957,9 @@ def build_graph(builder: flatbuffers.Builder, graph: Graph):
         node_offset = sg.NodeEnd(builder)
         node_offsets.append(node_offset)
 
-    graph_nodes = write_vec(builder, sg.GraphStartNodesVector, node_offsets, "offset")
-    inputs = write_vec(builder, sg.GraphStartInputsVector, graph.inputs, "u32")
-    outputs = write_vec(builder, sg.GraphStartOutputsVector, graph.outputs, "u32")
+    graph_nodes = write_vec(builder, node_offsets, "offset")
+    inputs = write_vec(builder, graph.inputs, "u32")
+    outputs = write_vec(builder, graph.outputs, "u32")
 
     sg.GraphStart(builder)
     sg.GraphAddNodes(builder, graph_nodes)
@@ -1266,7 +1968,31 @@ def build_graph(builder: flatbuffers.Builder, graph: Graph):
     return sg.GraphEnd(builder)
 
 
-def write_model(graph: Graph, metadata: Metadata, out_path: str):
+def estimate_model_size(graph: Graph) -> int:
+    """
+    Estimate the size of a graph once serialized into a FlatBuffers model.
+
+    The size of most models is dominated by tensor data. Other nodes only add
+    a small amount for their tables, names and shapes.
+    """
+    # Approximate size of the tables for a node, excluding variable-length
+    # data. This is an overestimate for most nodes.
+    node_overhead = 64
+
+    size = 1024
+    for node in graph.nodes:
+        size += node_overhead + len(node.name)
+        if isinstance(node, ConstantNode):
+            size += node.data.nbytes + TENSOR_DATA_ALIGNMENT + 4 * len(node.shape)
+    return size
+
+
+def write_model(
+    graph: Graph,
+    metadata: Metadata,
+    out_path: str,
+    builder: Optional[flatbuffers.Builder] = None,
+):
     """
     Serialize a model into a flatbuffers model.
 
@@ -1276,32 +2002,52 @@ def write_model(graph: Graph, metadata: Metadata, out_path: str):
     :param graph: The main graph for the model
     :param metadata: Model metadata
     :param out_path: Output .rten model path
+    :param builder: Empty builder to serialize the model with. When converting
+      several models, passing the same builder for each reuses its buffer. The
+      builder is cleared afterwards.
     """
 
-    builder = flatbuffers.Builder(initialSize=1024)
-
-    graph = build_graph(builder, graph)
-    metadata = build_metadata(builder, metadata)
-
-    sg.ModelStart(builder)
-    sg.ModelAddSchemaVersion(builder, 1)
-    sg.ModelAddGraph(builder, graph)
-    sg.ModelAddMetadata(builder, metadata)
-    model = sg.ModelEnd(builder)
-
-    builder.Finish(model)
-    data = builder.Output()
-
-    with open(out_path, "wb") as output:
-        output.write(data)
+    # Pre-size the buffer, since each time the builder grows its buffer, it
+    # copies all the data written so far.
+    initial_size = min(estimate_model_size(graph), flatbuffers.Builder.MAX_BUFFER_SIZE)
+    if builder is None:
+        builder = flatbuffers.Builder(initialSize=initial_size)
+    elif not initial_size <= len(builder.Bytes) <= 2 * initial_size:
+        # Replace a reused buffer if it is too small for this model, or much
+        # larger, so that converting a large model doesn't leave a large
+        # buffer allocated for the rest of a batch.
+        builder.Bytes = bytearray(initial_size)
+        builder.head = initial_size
+
+    try:
+        graph = build_graph(builder, graph)
+        metadata = build_metadata(builder, metadata)
+
+        sg.ModelStart(builder)
+        sg.ModelAddSchemaVersion(builder, 1)
+        sg.ModelAddGraph(builder, graph)
+        sg.ModelAddMetadata(builder, metadata)
+        model = sg.ModelEnd(builder)
+
+        builder.Finish(model)
+
+        # Write the used part of the builder's buffer directly, since
+        # `builder.Output()` returns a copy of it.
+        with open(out_path, "wb") as output:
+            output.write(memoryview(builder.Bytes)[builder.Head() :])
+    finally:
+        builder.Clear()
 
 
 def sha256(filename: str) -> str:
     """Generate SHA-256 hash of a file as a hex string."""
     hasher = hashlib.sha256()
     with open(filename, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
+        # Hash the memory-mapped file in one call, rather than reading it into
+        # memory in small chunks. Empty files can't be memory-mapped.
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                hasher.update(data)
     return hasher.hexdigest()
 
 
@@ -1330,23 +2076,66 @@ def generate_metadata(onnx_path: str, metadata_path: Optional[str] = None) -> Me
 
 def main():
     parser = ArgumentParser(description="Convert ONNX models to .rten format.")
-    parser.add_argument("model", help="Input ONNX model")
+    parser.add_argument(
+        "model",
+        help="Input ONNX model(s). If a single model is given, it may be followed by the output model file name.",
+        nargs="+",
+    )
     parser.add_argument(
         "-m", "--metadata", help="Path to JSON file containing model metadata."
     )
-    parser.add_argument("out_name", help="Output model file name", nargs="?")
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="When converting several models, load the next model while the current one is converted. This is faster, but uses memory for two models at once.",
+    )
     args = parser.parse_args()
 
-    model = onnx.load(args.model)
-    graph = graph_from_onnx_graph(model.graph)
-    metadata = generate_metadata(args.model, args.metadata)
-
-    output_path = args.out_name
-    if output_path is None:
-        model_basename = splitext(args.model)[0]
-        output_path = f"{model_basename}.rten"
-
-    write_model(graph, metadata, output_path)
+    model_paths = args.model
+    out_name = None
+    if len(model_paths) == 2 and splitext(model_paths[1])[1] != ".onnx":
+        model_paths, out_name = model_paths[:1], model_paths[1]
+
+    def load_model(model_path: str) -> onnx.ModelProto:
+        # Tensors stored in external data files are memory-mapped during
+        # conversion, rather than all being loaded into memory up front.
+        return onnx.load(model_path, load_external_data=False)
+
+    # The builder is shared by all models, so that its buffer only needs to
+    # be allocated once.
+    builder = flatbuffers.Builder()
+
+    # If prefetching is enabled, the next model is loaded in the background
+    # while the current one is converted. This overlaps loading with
+    # conversion, but means that two models are in memory at once.
+    with ThreadPoolExecutor(max_workers=1) as loader:
+        prefetched: Optional[Future[onnx.ModelProto]] = None
+        for i, model_path in enumerate(model_paths):
+            if prefetched is not None:
+                model = prefetched.result()
+                prefetched = None
+            else:
+                model = load_model(model_path)
+
+            if args.prefetch and i + 1 < len(model_paths):
+                prefetched = loader.submit(load_model, model_paths[i + 1])
+
+            output_path = out_name
+            if output_path is None:
+                model_basename = splitext(model_path)[0]
+                output_path = f"{model_basename}.rten"
+
+            # Unmap the model's external data files once it has been written.
+            with ExternalDataFiles() as data_files:
+                graph = graph_from_onnx_graph(
+                    model.graph,
+                    base_dir=os.path.dirname(model_path),
+                    data_files=data_files,
+                )
+                del model
+                metadata = generate_metadata(model_path, args.metadata)
+                write_model(graph, metadata, output_path, builder)
+                del graph
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+import unittest
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+
+from rten_convert.converter import (
+    ConstantNode,
+    Graph,
+    OperatorNode,
+    graph_from_onnx_graph,
+)
+
+
+def make_graph(
+    nodes: list[onnx.NodeProto],
+    initializers: dict[str, np.ndarray],
+    inputs: tuple[str, ...] = (),
+    outputs: tuple[str, ...] = ("y",),
+) -> onnx.GraphProto:
+    return helper.make_graph(
+        nodes,
+        "graph",
+        [
+            helper.make_tensor_value_info(name, TensorProto.FLOAT, None)
+            for name in inputs
+        ],
+        [
+            helper.make_tensor_value_info(name, TensorProto.FLOAT, None)
+            for name in outputs
+        ],
+        [numpy_helper.from_array(value, name) for name, value in initializers.items()],
+    )
+
+
+def constants(graph: Graph) -> dict[str, np.ndarray]:
+    return {
+        node.name: node.data for node in graph.nodes if isinstance(node, ConstantNode)
+    }
+
+
+def operators(graph: Graph) -> list[str]:
+    return [node.op_type for node in graph.nodes if isinstance(node, OperatorNode)]
+
+
+class TestConstantFolding(unittest.TestCase):
+    def test_fold_shape_computation(self):
+        # Shape -> Gather -> Unsqueeze -> Concat computing the target shape
+        # for a Reshape of a non-constant input.
+        onnx_graph = make_graph(
+            [
+                helper.make_node("Shape", ["w"], ["shape"]),
+                helper.make_node("Gather", ["shape", "index"], ["dim"], axis=0),
+                helper.make_node("Unsqueeze", ["dim", "axes"], ["dim_1d"]),
+                helper.make_node(
+                    "Concat", ["dim_1d", "minus_one"], ["new_shape"], axis=0
+                ),
+                helper.make_node("Reshape", ["x", "new_shape"], ["y"]),
+            ],
+            {
+                "w": np.zeros((2, 3, 4), dtype=np.float32),
+                "index": np.array(0, dtype=np.int64),
+                "axes": np.array([0], dtype=np.int64),
+                "minus_one": np.array([-1], dtype=np.int64),
+            },
+            inputs=("x",),
+        )
+
+        graph = graph_from_onnx_graph(onnx_graph)
+
+        self.assertEqual(operators(graph), ["Reshape"])
+        self.assertEqual(list(constants(graph).keys()), ["new_shape"])
+        new_shape = constants(graph)["new_shape"]
+        self.assertEqual(new_shape.dtype, np.int32)
+        self.assertEqual(new_shape.tolist(), [2, -1])
+
+    def test_fold_unsqueeze_axes(self):
+        data = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+        # Opset 11 specifies axes as an attribute, opset 13 as an input.
+        cases = [
+            (helper.make_node("Unsqueeze", ["data"], ["unsqueezed"], axes=[0, -1]), {}),
+            (
+                helper.make_node("Unsqueeze", ["data", "axes"], ["unsqueezed"]),
+                {"axes": np.array([0, -1], dtype=np.int64)},
+            ),
+        ]
+
+        for unsqueeze, axes in cases:
+            with self.subTest(inputs=list(unsqueeze.input)):
+                onnx_graph = make_graph(
+                    [unsqueeze, helper.make_node("Add", ["x", "unsqueezed"], ["y"])],
+                    {"data": data, **axes},
+                    inputs=("x",),
+                )
+
+                graph = graph_from_onnx_graph(onnx_graph)
+
+                self.assertEqual(operators(graph), ["Add"])
+                self.assertEqual(list(constants(graph).keys()), ["unsqueezed"])
+                self.assertEqual(constants(graph)["unsqueezed"].shape, (1, 2, 3, 1))
+
+    def test_does_not_fold_graph_output(self):
+        onnx_graph = make_graph(
+            [helper.make_node("Shape", ["w"], ["y"])],
+            {"w": np.zeros((2, 3), dtype=np.float32)},
+        )
+
+        graph = graph_from_onnx_graph(onnx_graph)
+
+        self.assertEqual(operators(graph), ["Shape"])
+        self.assertEqual(list(constants(graph).keys()), ["w"])
+
+    def test_keeps_constants_used_after_folding(self):
+        onnx_graph = make_graph(
+            [
+                helper.make_node("Shape", ["w"], ["shape"]),
+                helper.make_node("Reshape", ["x", "shape"], ["x_reshaped"]),
+                helper.make_node("Add", ["x_reshaped", "w"], ["y"]),
+            ],
+            {"w": np.ones((2, 3), dtype=np.float32)},
+            inputs=("x",),
+        )
+
+        graph = graph_from_onnx_graph(onnx_graph)
+
+        self.assertEqual(operators(graph), ["Reshape", "Add"])
+        self.assertEqual(sorted(constants(graph).keys()), ["shape", "w"])
+        self.assertEqual(constants(graph)["shape"].tolist(), [2, 3])
+
+    def test_does_not_fold_invalid_operator(self):
+        onnx_graph = make_graph(
+            [
+                helper.make_node("Reshape", ["w", "bad_shape"], ["w_reshaped"]),
+                helper.make_node("Add", ["x", "w_reshaped"], ["y"]),
+            ],
+            {
+                "w": np.zeros((2, 3), dtype=np.float32),
+                "bad_shape": np.array([4, 2], dtype=np.int64),
+            },
+            inputs=("x",),
+        )
+
+        graph = graph_from_onnx_graph(onnx_graph)
+
+        self.assertEqual(operators(graph), ["Reshape", "Add"])
+        self.assertEqual(sorted(constants(graph).keys()), ["bad_shape", "w"])
+
+
+if __name__ == "__main__":
+    unittest.main()
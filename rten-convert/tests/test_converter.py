@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+
+from rten_convert.converter import (
+    OperatorNode,
+    ValueNode,
+    graph_from_onnx_graph,
+    scalar_from_onnx_tensor,
+)
+import rten_convert.schema_generated as sg
+
+
+def external_tensor(
+    name: str, data: np.ndarray, data_type: int, base_dir: str
+) -> onnx.TensorProto:
+    """Create a tensor whose data is stored in a file in `base_dir`."""
+    location = f"{name}.bin"
+    with open(os.path.join(base_dir, location), "wb") as file:
+        file.write(data.tobytes())
+
+    tensor = TensorProto(name=name, data_type=data_type, dims=data.shape)
+    tensor.data_location = TensorProto.EXTERNAL
+    tensor.external_data.add(key="location", value=location)
+    return tensor
+
+
+class TestGraphFromOnnxGraph(unittest.TestCase):
+    def test_omitted_optional_output(self):
+        onnx_graph = helper.make_graph(
+            [
+                helper.make_node(
+                    "Split", ["x", "split"], ["a", "", "c"], name="split", axis=0
+                )
+            ],
+            "graph",
+            [helper.make_tensor_value_info("x", TensorProto.FLOAT, [6])],
+            [
+                helper.make_tensor_value_info("a", TensorProto.FLOAT, None),
+                helper.make_tensor_value_info("c", TensorProto.FLOAT, None),
+            ],
+            [numpy_helper.from_array(np.array([1, 2, 3], dtype=np.int64), "split")],
+        )
+
+        graph = graph_from_onnx_graph(onnx_graph)
+
+        value_names = [node.name for node in graph.nodes if isinstance(node, ValueNode)]
+        self.assertNotIn("", value_names)
+
+        [split] = [node for node in graph.nodes if isinstance(node, OperatorNode)]
+        a_id, omitted_id, c_id = split.outputs
+        self.assertIsNone(omitted_id)
+        assert a_id is not None and c_id is not None
+        self.assertEqual(graph.nodes[a_id].name, "a")
+        self.assertEqual(graph.nodes[c_id].name, "c")
+
+
+class TestScalarFromOnnxTensor(unittest.TestCase):
+    def test_raw_data(self):
+        cases = [
+            (np.array([2.5], dtype=np.float32), 2.5),
+            (np.array([-3], dtype=np.int32), -3),
+            (np.array([2**40], dtype=np.int64), 2**40),
+            # 0-d tensor
+            (np.array(7, dtype=np.int64), 7),
+        ]
+        for data, expected in cases:
+            with self.subTest(dtype=data.dtype.name, shape=data.shape):
+                tensor = numpy_helper.from_array(data, "value")
+                self.assertTrue(tensor.HasField("raw_data"))
+                self.assertEqual(scalar_from_onnx_tensor(tensor), expected)
+
+    def test_typed_field(self):
+        cases = [
+            (TensorProto.FLOAT, [1], [2.5]),
+            (TensorProto.INT32, [1, 1], [-3]),
+            (TensorProto.INT64, [1], [2**40]),
+            # 0-d tensor
+            (TensorProto.INT64, [], [7]),
+        ]
+        for data_type, dims, values in cases:
+            with self.subTest(data_type=data_type, dims=dims):
+                tensor = helper.make_tensor("value", data_type, dims, values)
+                self.assertFalse(tensor.HasField("raw_data"))
+                self.assertEqual(scalar_from_onnx_tensor(tensor), values[0])
+
+    def test_external_data(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            cases = [
+                ("float", np.array([2.5], dtype=np.float32), TensorProto.FLOAT),
+                ("int", np.array(-3, dtype=np.int64), TensorProto.INT64),
+            ]
+            for name, data, data_type in cases:
+                with self.subTest(name=name):
+                    tensor = external_tensor(name, data, data_type, base_dir)
+                    self.assertEqual(
+                        scalar_from_onnx_tensor(tensor, base_dir), data.item()
+                    )
+
+    def test_not_scalar(self):
+        tensor = numpy_helper.from_array(np.zeros(2, dtype=np.float32), "value")
+        with self.assertRaisesRegex(ValueError, "1-element tensor"):
+            scalar_from_onnx_tensor(tensor)
+
+    def test_constant_of_shape_clamps_int64_value(self):
+        i32 = np.iinfo(np.int32)
+        cases = [(2**40, i32.max), (-(2**40), i32.min), (5, 5)]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                onnx_graph = helper.make_graph(
+                    [
+                        helper.make_node(
+                            "ConstantOfShape",
+                            ["shape"],
+                            ["y"],
+                            value=helper.make_tensor(
+                                "value", TensorProto.INT64, [1], [value]
+                            ),
+                        )
+                    ],
+                    "graph",
+                    [helper.make_tensor_value_info("shape", TensorProto.INT64, [1])],
+                    [helper.make_tensor_value_info("y", TensorProto.INT64, None)],
+                )
+
+                graph = graph_from_onnx_graph(onnx_graph)
+
+                [op] = [node for node in graph.nodes if isinstance(node, OperatorNode)]
+                self.assertEqual(op.attrs.valueType, sg.Scalar.IntScalar)
+                self.assertEqual(op.attrs.value.value, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
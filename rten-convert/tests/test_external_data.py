@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import onnx
+from onnx import TensorProto, helper, numpy_helper
+from onnx.external_data_helper import convert_model_to_external_data
+
+from rten_convert.converter import (
+    ConstantNode,
+    ExternalDataFiles,
+    Graph,
+    array_from_onnx_tensor,
+    graph_from_onnx_graph,
+)
+
+
+def make_model() -> onnx.ModelProto:
+    constant = helper.make_node(
+        "Constant",
+        [],
+        ["c"],
+        value=numpy_helper.from_array(np.arange(16, dtype=np.float32), "value"),
+    )
+    add = helper.make_node("Add", ["c", "w"], ["sum"])
+    reshape = helper.make_node("Reshape", ["sum", "shape"], ["y"])
+    graph = helper.make_graph(
+        [constant, add, reshape],
+        "graph",
+        [],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, None)],
+        [
+            numpy_helper.from_array(np.linspace(0, 1, 16, dtype=np.float32), "w"),
+            numpy_helper.from_array(np.array([4, 4], dtype=np.int64), "shape"),
+        ],
+    )
+    return helper.make_model(graph)
+
+
+def make_external_tensor(
+    shape: list[int], location: str, offset: int, length: int
+) -> onnx.TensorProto:
+    tensor = TensorProto(name="w", data_type=TensorProto.FLOAT, dims=shape)
+    tensor.data_location = TensorProto.EXTERNAL
+    for key, value in [("location", location), ("offset", offset), ("length", length)]:
+        tensor.external_data.add(key=key, value=str(value))
+    return tensor
+
+
+def constants(graph: Graph) -> dict[str, np.ndarray]:
+    return {
+        node.name: node.data for node in graph.nodes if isinstance(node, ConstantNode)
+    }
+
+
+class TestExternalData(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = os.path.join(self.tmp_dir.name, "model")
+        os.mkdir(self.model_dir)
+
+        # Convert models from a different directory, to check that external
+        # data locations are resolved relative to the model.
+        self.cwd = os.getcwd()
+        work_dir = os.path.join(self.tmp_dir.name, "work")
+        os.mkdir(work_dir)
+        os.chdir(work_dir)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def test_convert_external_data(self):
+        model = make_model()
+        expected = constants(graph_from_onnx_graph(model.graph))
+
+        convert_model_to_external_data(
+            model,
+            location="model.onnx.data",
+            size_threshold=0,
+            convert_attribute=True,
+        )
+        model_path = os.path.join(self.model_dir, "model.onnx")
+        onnx.save(model, model_path)
+        model = onnx.load(model_path, load_external_data=False)
+
+        with ExternalDataFiles() as data_files:
+            graph = graph_from_onnx_graph(model.graph, self.model_dir, data_files)
+            actual = constants(graph)
+
+            self.assertEqual(actual.keys(), expected.keys())
+            for name, data in expected.items():
+                with self.subTest(name=name):
+                    self.assertEqual(actual[name].dtype, data.dtype)
+                    np.testing.assert_array_equal(actual[name], data)
+
+    def test_reject_location_outside_model_dir(self):
+        data = np.arange(4, dtype=np.float32)
+        outside_path = os.path.join(self.tmp_dir.name, "outside.bin")
+        with open(outside_path, "wb") as file:
+            file.write(data.tobytes())
+
+        for location in ["../outside.bin", outside_path]:
+            with self.subTest(location=location):
+                tensor = make_external_tensor([4], location, 0, data.nbytes)
+
+                with self.assertRaisesRegex(ValueError, "External data location"):
+                    array_from_onnx_tensor(tensor, self.model_dir)
+
+    def test_reject_data_outside_file(self):
+        with open(os.path.join(self.model_dir, "weights.bin"), "wb") as file:
+            file.write(np.arange(4, dtype=np.float32).tobytes())
+
+        tensor = make_external_tensor([4], "weights.bin", offset=8, length=16)
+
+        with self.assertRaisesRegex(ValueError, "does not match"):
+            array_from_onnx_tensor(tensor, self.model_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()